@@ -0,0 +1,33 @@
+"""Add the keyset pagination index on users
+
+Revision ID: 43daa33b3d21
+Revises:
+Create Date: 2026-10-15
+
+The app still creates missing tables with create_all on startup, which
+never alters an existing table. These revisions bring databases created
+by an earlier version up to the models. Each step is idempotent, so
+running them on a freshly created schema is harmless.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "43daa33b3d21"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_created_at_id_desc "
+            "ON users (created_at DESC, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_created_at_id_desc")
@@ -0,0 +1,42 @@
+"""Cover analytics windows with ix_users_analytics and drop redundant indexes
+
+Revision ID: 4ad239e5c3a1
+Revises: b6cbc2c30c6c
+Create Date: 2026-10-15
+
+ix_users_created_at and ix_users_created_at_role are covered by the
+created_at-led composite indexes, and city filters go through
+ix_users_city_norm.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "4ad239e5c3a1"
+down_revision = "b6cbc2c30c6c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_analytics "
+            "ON users (created_at DESC) INCLUDE (role, email_confirmed, city)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_created_at_role")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_city")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_city ON users (city)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_created_at "
+            "ON users (created_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_analytics")
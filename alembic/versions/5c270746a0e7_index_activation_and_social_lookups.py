@@ -0,0 +1,50 @@
+"""Index activation and social-login lookups by their full keys
+
+Revision ID: 5c270746a0e7
+Revises: 600103325260
+Create Date: 2026-10-15
+
+Building uq_users_auth_provider_user_id fails if two accounts already
+share a provider and provider user id; resolve those rows first.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5c270746a0e7"
+down_revision = "600103325260"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_activation "
+            "ON users (email, activation_token) "
+            "WHERE activation_token IS NOT NULL AND is_active = false"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "uq_users_auth_provider_user_id "
+            "ON users (auth_provider, provider_user_id) "
+            "WHERE provider_user_id IS NOT NULL"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_activation_token")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_provider_user_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_provider_user_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_provider_user_id "
+            "ON users (provider_user_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_activation_token "
+            "ON users (activation_token)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_auth_provider_user_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_activation")
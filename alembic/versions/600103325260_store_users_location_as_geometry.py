@@ -0,0 +1,34 @@
+"""Store users.location as a GiST-indexed geometry point
+
+Revision ID: 600103325260
+Revises: 4ad239e5c3a1
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "600103325260"
+down_revision = "4ad239e5c3a1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rewrites the table and rebuilds any index on the column
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN location "
+        "TYPE geometry(Point, 4326) USING location::geometry"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_location "
+        "ON users USING GIST (location)"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN location "
+        "TYPE geography(Point, 4326) USING location::geography"
+    )
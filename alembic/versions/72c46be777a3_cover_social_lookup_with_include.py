@@ -0,0 +1,44 @@
+"""Rebuild uq_users_auth_provider_user_id with INCLUDE (id, email, role)
+
+Revision ID: 72c46be777a3
+Revises: 97b687277734
+Create Date: 2026-10-15
+
+The replacement is built next to the old index and renamed into place,
+so uniqueness is enforced throughout.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "72c46be777a3"
+down_revision = "97b687277734"
+branch_labels = None
+depends_on = None
+
+
+def _rebuild(include: str) -> None:
+    """Swap in a copy of the social-login index with the given INCLUDE clause."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS uq_users_auth_provider_user_id_new"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY uq_users_auth_provider_user_id_new "
+            f"ON users (auth_provider, provider_user_id) {include} "
+            "WHERE provider_user_id IS NOT NULL"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_auth_provider_user_id")
+        op.execute(
+            "ALTER INDEX uq_users_auth_provider_user_id_new "
+            "RENAME TO uq_users_auth_provider_user_id"
+        )
+
+
+def upgrade() -> None:
+    _rebuild("INCLUDE (id, email, role)")
+
+
+def downgrade() -> None:
+    _rebuild("")
@@ -0,0 +1,51 @@
+"""Store only a SHA-256 hash of the current refresh token
+
+Revision ID: 920fd0719034
+Revises: 72c46be777a3
+Create Date: 2026-10-15
+
+Existing refresh tokens are hashed in place, so current sessions keep
+working. The downgrade cannot recover the tokens; users sign in again.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "920fd0719034"
+down_revision = "72c46be777a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS refresh_token_hash BYTEA")
+    op.execute(
+        "COMMENT ON COLUMN users.refresh_token_hash IS "
+        "'SHA-256 of the current refresh token; the token itself is never stored'"
+    )
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'users' AND column_name = 'refresh_token'
+            ) THEN
+                UPDATE users
+                SET refresh_token_hash = sha256(convert_to(refresh_token, 'UTF8'))
+                WHERE refresh_token IS NOT NULL;
+                ALTER TABLE users DROP COLUMN refresh_token;
+            END IF;
+        END $$
+        """)
+
+
+def downgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "refresh_token", sa.Text(), nullable=True, comment="Current refresh token"
+        ),
+    )
+    op.drop_column("users", "refresh_token_hash")
@@ -0,0 +1,23 @@
+"""Let PostgreSQL stamp users.created_at
+
+Revision ID: 97b687277734
+Revises: 5c270746a0e7
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "97b687277734"
+down_revision = "5c270746a0e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("users", "created_at", server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    op.alter_column("users", "created_at", server_default=None)
@@ -0,0 +1,37 @@
+"""Add the generated users.city_norm column and its index
+
+Revision ID: b6cbc2c30c6c
+Revises: 43daa33b3d21
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b6cbc2c30c6c"
+down_revision = "43daa33b3d21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS city_norm VARCHAR(100) "
+        "GENERATED ALWAYS AS (lower(city)) STORED"
+    )
+    op.execute(
+        "COMMENT ON COLUMN users.city_norm IS "
+        "'Lower-cased city for case-insensitive filtering'"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_city_norm "
+            "ON users (city_norm)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_city_norm")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS city_norm")
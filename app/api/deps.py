@@ -1,5 +1,8 @@
+import asyncio
 import secrets
-from typing import Annotated, Optional
+import time
+from typing import Annotated, Any
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import (
     HTTPBasic,
@@ -7,12 +10,12 @@ from fastapi.security import (
     HTTPBearer,
     HTTPAuthorizationCredentials,
 )
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.core.security import decode_token, verify_token_type
+from app.helpers.user_helpers import NO_LAZY_LOADS, select_user
+from app.core.security import decode_token, hash_token, verify_token_type
 from app.core.redis import is_token_blacklisted
 from app.core.logging import get_logger
 
@@ -21,6 +24,21 @@ logger = get_logger(__name__)
 security = HTTPBasic()
 bearer_security = HTTPBearer()
 
+# Admin credentials are constant; encode them once
+_ADMIN_USERNAME_BYTES = settings.ADMIN_USERNAME.encode("utf-8")
+_ADMIN_PASSWORD_BYTES = settings.ADMIN_PASSWORD.encode("utf-8")
+
+# Validated access tokens, keyed by hash_token(token): (payload, user_id, exp)
+TOKEN_CACHE_TTL_SECONDS = 30
+
+
+def _token_ttu(key: bytes, value: tuple[dict[str, Any], int, int], now: float) -> float:
+    """Expire cached tokens after the cache TTL or at token expiry, whichever is first."""
+    return min(now + TOKEN_CACHE_TTL_SECONDS, value[2])
+
+
+_token_cache: TLRUCache = TLRUCache(maxsize=10000, ttu=_token_ttu, timer=time.time)
+
 
 async def verify_admin(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
@@ -39,10 +57,10 @@ async def verify_admin(
     """
     # Use constant-time comparison to prevent timing attacks
     is_username_correct = secrets.compare_digest(
-        credentials.username.encode("utf-8"), settings.ADMIN_USERNAME.encode("utf-8")
+        credentials.username.encode("utf-8"), _ADMIN_USERNAME_BYTES
     )
     is_password_correct = secrets.compare_digest(
-        credentials.password.encode("utf-8"), settings.ADMIN_PASSWORD.encode("utf-8")
+        credentials.password.encode("utf-8"), _ADMIN_PASSWORD_BYTES
     )
 
     if not (is_username_correct and is_password_correct):
@@ -62,6 +80,22 @@ AdminDep = Annotated[HTTPBasicCredentials, Depends(verify_admin)]
 DBSessionDep = Annotated[AsyncSession, Depends(get_db)]
 
 
+async def _get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    """Fetch a user by email, or None if no such user exists."""
+    result = await db.execute(select_user().where(User.email == email))
+    return result.scalar_one_or_none()
+
+
+def invalidate_token_cache(token: str) -> None:
+    """
+    Forget a token's cached validation in this worker.
+
+    Args:
+        token: JWT access token
+    """
+    _token_cache.pop(hash_token(token), None)
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_security)],
     db: DBSessionDep,
@@ -85,11 +119,39 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Decode token
     token = credentials.credentials
 
-    # Check if token is blacklisted
-    if await is_token_blacklisted(token):
+    # Fast path: token already validated by this worker
+    token_key = hash_token(token)
+    cached = _token_cache.get(token_key)
+    if cached is not None and cached[2] > time.time():
+        payload, user_id, _ = cached
+        email = payload["sub"]
+        user_lookup = db.get(User, user_id, options=[NO_LAZY_LOADS])
+    else:
+        payload = decode_token(token)
+
+        if payload is None:
+            logger.warning("Invalid JWT token received")
+            raise credentials_exception
+
+        # Verify token type
+        if not verify_token_type(payload, "access"):
+            raise credentials_exception
+
+        # Extract user email from token
+        email = payload.get("sub")
+        if email is None:
+            logger.warning("JWT token missing subject claim")
+            raise credentials_exception
+
+        user_id = None
+        user_lookup = _get_user_by_email(db, email)
+
+    # Blacklist (Redis) and user lookup (Postgres) are independent; run both
+    blacklisted, user = await asyncio.gather(is_token_blacklisted(token), user_lookup)
+
+    if blacklisted:
         logger.warning("Blacklisted token attempted access")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,25 +159,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(token)
-
-    if payload is None:
-        logger.warning("Invalid JWT token received")
-        raise credentials_exception
-
-    # Verify token type
-    if not verify_token_type(payload, "access"):
-        raise credentials_exception
-
-    # Extract user email from token
-    email: Optional[str] = payload.get("sub")
-    if email is None:
-        logger.warning("JWT token missing subject claim")
-        raise credentials_exception
-
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    if user is not None and user_id is None:
+        _token_cache[token_key] = (payload, user.id, payload.get("exp", 0))
 
     if user is None:
         logger.warning(f"User not found for email: {email}")
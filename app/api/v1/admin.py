@@ -1,21 +1,49 @@
+import asyncio
+import base64
 import csv
-import json
 import logging
 from io import StringIO, BytesIO
 from datetime import datetime
+from typing import AsyncIterator, Iterable, Sequence
+import orjson
 from fastapi import APIRouter, Query, HTTPException, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy import select, func
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, tuple_, Row, Select
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from app.api.deps import DBSessionDep, AdminDep
+from app.database import AsyncSessionLocal
 from app.models.user import User, UserRole
-from app.schemas.user import UserListResponse, UserResponse
+from app.schemas.user import (
+    ExportFormat,
+    RecentUsersResponse,
+    UserListResponse,
+    UserResponse,
+)
 from app.config import settings
-from app.core.analytics import get_signup_analytics, get_recent_signups
+from app.core.analytics import (
+    get_signup_analytics_json,
+    get_recent_signups,
+    STATS_CACHE_KEY,
+    STATS_CACHE_TTL,
+    USERS_TOTAL_CACHE_KEY,
+    USERS_TOTAL_CACHE_TTL,
+)
+from app.core.redis import get_cached_value, set_cached_value
 
 router = APIRouter(prefix="/api/v1/admin")
 logger = logging.getLogger(__name__)
 
+# Validates a whole page of ORM rows in one call
+_USER_LIST_ADAPTER = TypeAdapter(list[UserResponse])
+
+# Exactly the columns UserResponse exposes, for listings built from rows
+_USER_RESPONSE_COLUMNS = tuple(
+    getattr(User, name) for name in UserResponse.model_fields
+)
+
 
 @router.get(
     "/signups",
@@ -35,40 +63,94 @@ async def list_users(
     ),
     role: UserRole | None = Query(default=None, description="Filter by role"),
     city: str | None = Query(default=None, description="Filter by city"),
-) -> UserListResponse:
+    after: str | None = Query(
+        default=None,
+        description="Cursor from a previous page's next_cursor; takes precedence over page",
+    ),
+) -> Response:
     """
     List all users with pagination and filtering.
 
+    Pass `after` (the `next_cursor` of the previous response) to page
+    through deep result sets without an OFFSET scan.
+
     Requires HTTP Basic Auth with admin credentials.
     """
-    # Build base query
-    query = select(User)
-
-    # Apply filters
+    # Build filters
+    filters = []
     if role:
-        query = query.where(User.role == role)
+        filters.append(User.role == role)
     if city:
-        query = query.where(User.city == city)
+        filters.append(User.city_norm == city.lower())
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    cursor = _parse_cursor(after) if after else None
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(User.created_at.desc())
+    # Build base query
+    query = select(*_USER_RESPONSE_COLUMNS).where(*filters)
+
+    # Get total count
+    cached_total = None if filters else await get_cached_value(USERS_TOTAL_CACHE_KEY)
+    if cached_total is not None:
+        total = int(cached_total)
+    else:
+        count_query = select(func.count(User.id)).where(*filters)
+        total_result = await db.execute(count_query)
+        total = total_result.scalar_one()
+        if not filters:
+            await set_cached_value(
+                USERS_TOTAL_CACHE_KEY, str(total), USERS_TOTAL_CACHE_TTL
+            )
+
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    query = query.order_by(User.created_at.desc(), User.id.desc()).limit(page_size)
+    if cursor:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*cursor))
+    else:
+        query = query.offset((page - 1) * page_size)
 
-    # Execute query
+    # Execute query; rows come straight from the database, so the models
+    # are constructed without re-validating each field
     result = await db.execute(query)
-    users = result.scalars().all()
+    users = [UserResponse.model_construct(**row._mapping) for row in result]
+
+    next_cursor = None
+    if len(users) == page_size:
+        last = users[-1]
+        next_cursor = _encode_cursor(last.created_at, last.id)
 
-    return UserListResponse(
+    # Serialized in one pass by pydantic-core and sent as-is
+    body = UserListResponse(
         total=total,
         page=page,
         page_size=page_size,
-        users=[UserResponse.model_validate(u) for u in users],
-    )
+        users=users,
+        next_cursor=next_cursor,
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+
+def _encode_cursor(created_at: datetime, user_id: int) -> str:
+    """
+    Build an opaque pagination cursor from the last row of a page.
+
+    The `<created_at>,<id>` pair is URL-safe base64 encoded without padding,
+    so the '+' of the timezone offset survives an unencoded query string.
+    """
+    raw = f"{created_at.isoformat()},{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _parse_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor built by `_encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, user_id = raw.rpartition(",")
+        return datetime.fromisoformat(created_at), int(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
 
 
 @router.get(
@@ -79,9 +161,7 @@ async def list_users(
 async def export_users(
     db: DBSessionDep,
     admin: AdminDep,
-    format: str = Query(
-        default="csv", regex="^(csv|json|excel)$", description="Export format"
-    ),
+    format: ExportFormat = Query(default=ExportFormat.CSV, description="Export format"),
     role: UserRole | None = Query(default=None, description="Filter by role"),
 ) -> StreamingResponse:
     """
@@ -92,17 +172,17 @@ async def export_users(
 
     Requires HTTP Basic Auth with admin credentials.
     """
-    # Build query
-    query = select(User).order_by(User.created_at.desc())
+    # Build query over the exported columns only; rows skip ORM hydration
+    query = select(*EXPORT_COLUMNS).order_by(User.created_at.desc())
 
     if role:
         query = query.where(User.role == role)
 
-    # Execute query
-    result = await db.execute(query)
-    users = result.scalars().all()
-
-    if not users:
+    # Bail out early if there is nothing to export
+    exists_result = await db.execute(
+        query.with_only_columns(User.id).order_by(None).limit(1)
+    )
+    if exists_result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No users found to export"
         )
@@ -112,155 +192,194 @@ async def export_users(
     role_suffix = f"_{role.value}" if role else "_all"
 
     # Export based on format
-    if format == "csv":
-        return _export_csv(users, f"restokr_users{role_suffix}_{timestamp}.csv")
-    elif format == "json":
-        return _export_json(users, f"restokr_users{role_suffix}_{timestamp}.json")
-    elif format == "excel":
-        return _export_excel(users, f"restokr_users{role_suffix}_{timestamp}.xlsx")
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid export format. Use: csv, json, or excel",
-        )
-
+    exporter, extension = _EXPORTERS[format]
+    return await exporter(query, f"restokr_users{role_suffix}_{timestamp}.{extension}")
+
+
+EXPORT_COLUMNS = (
+    User.id,
+    User.full_name,
+    User.email,
+    User.phone_number,
+    User.role,
+    User.city,
+    User.created_at,
+    User.email_confirmed,
+    User.is_exported,
+)
 
-def _export_csv(users: list[User], filename: str) -> StreamingResponse:
-    """Export users as CSV."""
-    output = StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(
-        [
-            "ID",
-            "Full Name",
-            "Email",
-            "Phone Number",
-            "Role",
-            "City",
-            "Created At",
-            "Email Confirmed",
-            "Exported",
-        ]
+EXPORT_HEADERS = [
+    "ID",
+    "Full Name",
+    "Email",
+    "Phone Number",
+    "Role",
+    "City",
+    "Created At",
+    "Email Confirmed",
+    "Exported",
+]
+
+
+EXCEL_CHUNK_SIZE = 64 * 1024
+
+# Fixed column widths, sized for typical values of each export column
+EXCEL_COLUMN_WIDTHS = {
+    "A": 8,
+    "B": 30,
+    "C": 36,
+    "D": 18,
+    "E": 12,
+    "F": 20,
+    "G": 34,
+    "H": 18,
+    "I": 12,
+}
+
+# Rows fetched per round trip from the server-side export cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_fields(row: Row) -> tuple:
+    """Flatten an export row into plain cell values."""
+    return (
+        row.id,
+        row.full_name,
+        row.email,
+        row.phone_number,
+        row.role.value,
+        row.city,
+        row.created_at.isoformat(),
+        row.email_confirmed,
+        row.is_exported,
     )
 
-    # Write data
-    for user in users:
-        writer.writerow(
-            [
-                user.id,
-                user.full_name,
-                user.email,
-                user.phone_number,
-                user.role.value,
-                user.city,
-                user.created_at.isoformat(),
-                user.email_confirmed,
-                user.is_exported,
-            ]
+
+async def _csv_iter(query: Select) -> AsyncIterator[str]:
+    """Yield the export as CSV, one chunk per server-side cursor batch."""
+    # One buffer and writer per stream, rewound between chunks
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    def render(rows: Iterable[list | tuple]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    yield render([EXPORT_HEADERS])
+
+    # The request session is closed once the endpoint returns, so the
+    # stream runs on its own session for the lifetime of the response.
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
         )
+        async for batch in result.partitions():
+            yield render(map(_export_fields, batch))
 
-    output.seek(0)
 
+async def _export_csv(query: Select, filename: str) -> StreamingResponse:
+    """Export users as CSV, streamed row by row."""
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _csv_iter(query),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
-def _export_json(users: list[User], filename: str) -> StreamingResponse:
-    """Export users as JSON."""
-    data = [
-        {
-            "id": u.id,
-            "full_name": u.full_name,
-            "email": u.email,
-            "phone_number": u.phone_number,
-            "role": u.role.value,
-            "city": u.city,
-            "created_at": u.created_at.isoformat(),
-            "email_confirmed": u.email_confirmed,
-            "is_exported": u.is_exported,
-        }
-        for u in users
-    ]
-
-    json_str = json.dumps(data, indent=2)
+async def _json_iter(query: Select) -> AsyncIterator[bytes]:
+    """Yield the export as a JSON array, one encoded object per row."""
+    yield b"["
+    separator = b""
 
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for row in result:
+            yield separator + orjson.dumps(
+                {
+                    "id": row.id,
+                    "full_name": row.full_name,
+                    "email": row.email,
+                    "phone_number": row.phone_number,
+                    "role": row.role.value,
+                    "city": row.city,
+                    "created_at": row.created_at,
+                    "email_confirmed": row.email_confirmed,
+                    "is_exported": row.is_exported,
+                },
+                option=orjson.OPT_NAIVE_UTC,
+            )
+            separator = b","
+
+    yield b"]"
+
+
+async def _export_json(query: Select, filename: str) -> StreamingResponse:
+    """Export users as JSON, streamed row by row."""
     return StreamingResponse(
-        iter([json_str]),
+        _json_iter(query),
         media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
-def _export_excel(users: list[User], filename: str) -> StreamingResponse:
-    """Export users as Excel."""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Users"
-
-    # Write header
-    headers = [
-        "ID",
-        "Full Name",
-        "Email",
-        "Phone Number",
-        "Role",
-        "City",
-        "Created At",
-        "Email Confirmed",
-        "Exported",
-    ]
-    ws.append(headers)
-
-    # Style header
-    for cell in ws[1]:
-        cell.font = cell.font.copy(bold=True)
+def _build_xlsx_bytes(rows: Sequence[Row]) -> bytes:
+    """Serialize export rows into an .xlsx workbook (blocking)."""
+    # Write-only mode streams rows to the archive instead of keeping a
+    # Cell object per value in memory.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Users")
 
-    # Write data
-    for user in users:
-        ws.append(
-            [
-                user.id,
-                user.full_name,
-                user.email,
-                user.phone_number,
-                user.role.value,
-                user.city,
-                user.created_at.isoformat(),
-                user.email_confirmed,
-                user.is_exported,
-            ]
-        )
+    # Column widths must be set before any row is written
+    for column_letter, width in EXCEL_COLUMN_WIDTHS.items():
+        ws.column_dimensions[column_letter].width = width
 
-    # Auto-size columns
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    # Write bold header
+    header_font = Font(bold=True)
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # Write data
+    for row in rows:
+        ws.append(_export_fields(row))
 
     # Save to bytes
     output = BytesIO()
     wb.save(output)
-    output.seek(0)
+    return output.getvalue()
+
+
+async def _export_excel(query: Select, filename: str) -> StreamingResponse:
+    """Export users as Excel."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        rows = result.all()
+
+    # openpyxl is synchronous; keep the event loop free while it runs
+    content = await asyncio.to_thread(_build_xlsx_bytes, rows)
+    output = BytesIO(content)
 
     return StreamingResponse(
-        iter([output.getvalue()]),
+        iter(lambda: output.read(EXCEL_CHUNK_SIZE), b""),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
+_EXPORTERS = {
+    ExportFormat.CSV: (_export_csv, "csv"),
+    ExportFormat.JSON: (_export_json, "json"),
+    ExportFormat.EXCEL: (_export_excel, "xlsx"),
+}
+
+
 @router.get(
     "/stats",
     summary="Get User Statistics (Admin)",
@@ -269,23 +388,31 @@ def _export_excel(users: list[User], filename: str) -> StreamingResponse:
 async def get_stats(
     db: DBSessionDep,
     admin: AdminDep,
-) -> dict:
+) -> Response:
     """
     Get user statistics.
 
     Requires HTTP Basic Auth with admin credentials.
     """
-    # Total users
-    total_result = await db.execute(select(func.count(User.id)))
-    total = total_result.scalar_one()
-
-    # Count by role
-    role_counts = {}
-    for role in UserRole:
-        role_result = await db.execute(
-            select(func.count(User.id)).where(User.role == role)
-        )
-        role_counts[role.value] = role_result.scalar_one()
+    # Cached body is already JSON; send it as-is
+    cached = await get_cached_value(STATS_CACHE_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Per-role totals and confirmations in a single grouped scan
+    role_result = await db.execute(
+        select(
+            User.role,
+            func.count(User.id),
+            func.count(User.id).filter(User.email_confirmed == True),
+        ).group_by(User.role)
+    )
+    role_counts = {role.value: 0 for role in UserRole}
+    total = confirmed = 0
+    for role, role_total, role_confirmed in role_result.all():
+        role_counts[role.value] = role_total
+        total += role_total
+        confirmed += role_confirmed
 
     # Count by city
     city_result = await db.execute(
@@ -293,19 +420,16 @@ async def get_stats(
     )
     city_counts = {city: count for city, count in city_result.all()}
 
-    # Email confirmation rate
-    confirmed_result = await db.execute(
-        select(func.count(User.id)).where(User.email_confirmed == True)
-    )
-    confirmed = confirmed_result.scalar_one()
-
-    return {
+    stats = {
         "total_users": total,
         "by_role": role_counts,
         "by_city": city_counts,
         "email_confirmed": confirmed,
-        "confirmation_rate": f"{(confirmed/total*100):.1f}%" if total > 0 else "0%",
+        "confirmation_rate": confirmed / total if total else 0.0,
     }
+    body = orjson.dumps(stats)
+    await set_cached_value(STATS_CACHE_KEY, body, STATS_CACHE_TTL)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -319,20 +443,21 @@ async def get_analytics(
     days: int = Query(
         default=30, ge=1, le=365, description="Number of days to analyze"
     ),
-) -> dict:
+) -> Response:
     """
     Get advanced analytics with trends and growth metrics.
 
     Requires HTTP Basic Auth with admin credentials.
     """
     logger.info(f"Admin requesting analytics for last {days} days")
-    analytics = await get_signup_analytics(db, days=days)
+    analytics = await get_signup_analytics_json(db, days=days)
     logger.info("Analytics data retrieved successfully")
-    return analytics
+    return Response(content=analytics, media_type="application/json")
 
 
 @router.get(
     "/recent",
+    response_model=RecentUsersResponse,
     summary="Get Recent Users (Admin)",
     description="Get the most recent users. Requires admin authentication.",
 )
@@ -340,7 +465,7 @@ async def get_recent(
     db: DBSessionDep,
     admin: AdminDep,
     limit: int = Query(default=10, ge=1, le=100, description="Number of recent users"),
-) -> dict:
+) -> Response:
     """
     Get recent users.
 
@@ -348,7 +473,6 @@ async def get_recent(
     """
     logger.info(f"Admin requesting {limit} recent users")
     recent = await get_recent_signups(db, limit=limit)
-    return {
-        "count": len(recent),
-        "users": [UserResponse.model_validate(s) for s in recent],
-    }
+    users = _USER_LIST_ADAPTER.validate_python(recent, from_attributes=True)
+    body = RecentUsersResponse(count=len(users), users=users).model_dump_json()
+    return Response(content=body, media_type="application/json")
@@ -1,10 +1,12 @@
 """Authentication endpoints for login, logout, refresh tokens, and account activation."""
 
+import time
 from datetime import datetime, timedelta
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy import select, update, or_
-from app.api.deps import DBSessionDep, CurrentUserDep
+from sqlalchemy import select, update, or_, func, literal, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import DBSessionDep, CurrentUserDep, invalidate_token_cache
 from app.models.user import User
 from app.schemas.auth import (
     TokenResponse,
@@ -15,15 +17,23 @@ from app.schemas.auth import (
     LoginRequest,
 )
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    aget_password_hash,
     create_access_token,
     create_refresh_token,
     decode_token,
+    hash_token,
     verify_token_type,
     generate_activation_token,
 )
-from app.core.redis import blacklist_token
+from app.core.redis import (
+    blacklist_token,
+    is_token_blacklisted,
+    cache_access_token,
+    get_cached_access_token,
+    invalidate_access_token,
+)
+from app.core.analytics import invalidate_signup_metrics
+from app.services.auth_service import login_with_password
 from app.core.logging import get_logger
 from app.config import settings
 
@@ -50,55 +60,7 @@ async def login(
     Raises:
         HTTPException: If credentials are invalid or account not activated
     """
-    logger.info(f"Login attempt for email: {login_data.email}")
-
-    # Fetch user by email
-    result = await db.execute(select(User).where(User.email == login_data.email))
-    user = result.scalar_one_or_none()
-
-    # Verify user exists and password is correct
-    if (
-        not user
-        or not user.password
-        or not verify_password(login_data.password, user.password)
-    ):
-        logger.warning(f"Failed login attempt for email: {login_data.email}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Check if account is activated
-    if not user.is_active:
-        logger.warning(f"Inactive account login attempt: {login_data.email}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account not activated. Please check your email for activation instructions.",
-        )
-
-    # Create tokens
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    refresh_token = create_refresh_token(data={"sub": user.email})
-
-    # Update user's refresh token and last login
-    await db.execute(
-        update(User)
-        .where(User.id == user.id)
-        .values(refresh_token=refresh_token, last_login=datetime.utcnow())
-    )
-    await db.commit()
-
-    logger.info(f"Successful login for user: {login_data.email}")
-
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    return await login_with_password(login_data, db)
 
 
 @router.post("/logout", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -121,15 +83,23 @@ async def logout(
     logger.info(f"Logout request for user: {current_user.email}")
 
     # Extract token from Authorization header
-    token = authorization.replace("Bearer ", "").strip()
+    scheme, _, token = authorization.partition(" ")
+    token = token.strip()
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Authorization header must use the Bearer scheme",
+        )
 
     # Blacklist the access token
     token_expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     await blacklist_token(token, token_expires_in)
+    invalidate_token_cache(token)
+    await invalidate_access_token(current_user.email)
 
     # Clear refresh token in database
     await db.execute(
-        update(User).where(User.id == current_user.id).values(refresh_token=None)
+        update(User).where(User.id == current_user.id).values(refresh_token_hash=None)
     )
     await db.commit()
 
@@ -181,12 +151,43 @@ async def refresh_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Fetch user
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # Hand back the current tokens while they are comfortably valid
+    if payload.get("exp", 0) - time.time() > settings.REFRESH_REUSE_THRESHOLD_SECONDS:
+        tokens = await _reuse_tokens(db, email, request.refresh_token)
+        if tokens is not None:
+            logger.info(f"Reused current tokens for user: {email}")
+            return tokens
+
+    # Rotate the refresh token only if the presented one is still current
+    # (compare-and-swap, so concurrent refreshes cannot both succeed)
+    presented_hash = hash_token(request.refresh_token)
+    new_refresh_token = create_refresh_token(data={"sub": email})
+    result = await db.execute(
+        update(User)
+        .where(
+            User.email == email,
+            User.refresh_token_hash == presented_hash,
+            User.is_active == True,
+        )
+        .values(refresh_token_hash=hash_token(new_refresh_token))
+        .returning(User.role)
+    )
+    role = result.scalar_one_or_none()
+
+    if role is None:
+        # Failure path only: tell a deactivated account apart from a stale token
+        result = await db.execute(
+            select(User.is_active, User.refresh_token_hash).where(User.email == email)
+        )
+        row = result.one_or_none()
+
+        if row is not None and row.refresh_token_hash == presented_hash:
+            logger.warning(f"Inactive account refresh attempt: {email}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account has been deactivated",
+            )
 
-    # Verify user exists and token matches stored token
-    if not user or user.refresh_token != request.refresh_token:
         logger.warning(f"Refresh token mismatch for user: {email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -194,25 +195,12 @@ async def refresh_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check if account is still active
-    if not user.is_active:
-        logger.warning(f"Inactive account refresh attempt: {email}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account has been deactivated",
-        )
-
-    # Create new tokens
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    new_refresh_token = create_refresh_token(data={"sub": user.email})
+    await db.commit()
 
-    # Update refresh token in database
-    await db.execute(
-        update(User).where(User.id == user.id).values(refresh_token=new_refresh_token)
+    access_token = create_access_token(data={"sub": email, "role": role.value})
+    await cache_access_token(
+        email, access_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
-    await db.commit()
 
     logger.info(f"Access token refreshed for user: {email}")
 
@@ -224,6 +212,56 @@ async def refresh_access_token(
     )
 
 
+async def _reuse_tokens(
+    db: AsyncSession, email: str, refresh_token: str
+) -> Optional[TokenResponse]:
+    """
+    Return the user's current token pair if it can be handed out again.
+
+    The cached access token must still be valid beyond the reuse threshold
+    and not revoked, and the refresh token must still be the stored one.
+
+    Args:
+        db: Database session
+        email: User email from the refresh token
+        refresh_token: Refresh token presented by the client
+
+    Returns:
+        Optional[TokenResponse]: Current tokens, or None if new ones are needed
+    """
+    access_token = await get_cached_access_token(email)
+    if access_token is None:
+        return None
+
+    access_payload = decode_token(access_token)
+    if access_payload is None:
+        return None
+
+    expires_in = int(access_payload.get("exp", 0) - time.time())
+    if expires_in <= settings.REFRESH_REUSE_THRESHOLD_SECONDS:
+        return None
+
+    if await is_token_blacklisted(access_token):
+        return None
+
+    result = await db.execute(
+        select(User.id).where(
+            User.email == email,
+            User.refresh_token_hash == hash_token(refresh_token),
+            User.is_active == True,
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        return None
+
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=expires_in,
+    )
+
+
 @router.post(
     "/activate", response_model=MessageResponse, status_code=status.HTTP_200_OK
 )
@@ -246,54 +284,68 @@ async def activate_account(
     """
     logger.info(f"Account activation attempt for email: {request.email}")
 
-    # Fetch user by email
-    result = await db.execute(select(User).where(User.email == request.email))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        logger.warning(f"Activation attempt for non-existent user: {request.email}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+    # Activate in one statement when the token is valid and unexpired
+    result = await db.execute(
+        update(User)
+        .where(
+            User.email == request.email,
+            User.is_active == False,
+            User.activation_token == request.activation_token,
+            or_(
+                User.activation_token_expiry.is_(None),
+                User.activation_token_expiry >= datetime.utcnow(),
+            ),
         )
-
-    # Check if already activated
-    if user.is_active:
-        logger.info(f"Activation attempt for already active account: {request.email}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Account is already activated",
+        .values(
+            is_active=True,
+            activation_token=None,
+            activation_token_expiry=None,
         )
+        .returning(User.id)
+    )
 
-    # Verify activation token
-    if user.activation_token != request.activation_token:
-        logger.warning(f"Invalid activation token for user: {request.email}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid activation token",
+    if result.scalar_one_or_none() is None:
+        # Failure path only: work out why activation was refused
+        result = await db.execute(
+            select(
+                User.is_active,
+                User.activation_token,
+                User.activation_token_expiry,
+            ).where(User.email == request.email)
         )
+        user = result.one_or_none()
+
+        if not user:
+            logger.warning(f"Activation attempt for non-existent user: {request.email}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+
+        # Check if already activated
+        if user.is_active:
+            logger.info(
+                f"Activation attempt for already active account: {request.email}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Account is already activated",
+            )
+
+        # Verify activation token
+        if user.activation_token != request.activation_token:
+            logger.warning(f"Invalid activation token for user: {request.email}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid activation token",
+            )
 
-    # Check token expiry
-    if (
-        user.activation_token_expiry
-        and user.activation_token_expiry < datetime.utcnow()
-    ):
         logger.warning(f"Expired activation token for user: {request.email}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Activation token has expired. Please request a new one.",
         )
 
-    # Activate account
-    await db.execute(
-        update(User)
-        .where(User.id == user.id)
-        .values(
-            is_active=True,
-            activation_token=None,
-            activation_token_expiry=None,
-        )
-    )
     await db.commit()
 
     logger.info(f"Account activated successfully for user: {request.email}")
@@ -326,33 +378,34 @@ async def resend_activation_token(
     """
     logger.info(f"Activation token resend request for email: {email}")
 
-    # Fetch user by email
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # Generate new activation token
+    new_token = generate_activation_token()
+    expiry = datetime.utcnow() + timedelta(days=7)
+
+    # Replace the token in one statement if the account is still inactive
+    result = await db.execute(
+        update(User)
+        .where(User.email == email, User.is_active == False)
+        .values(activation_token=new_token, activation_token_expiry=expiry)
+        .returning(User.id, User.email, User.full_name)
+    )
 
-    if not user:
-        logger.warning(f"Resend activation attempt for non-existent user: {email}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+    if result.one_or_none() is None:
+        # Failure path only: missing user or already activated
+        result = await db.execute(select(User.id).where(User.email == email))
+        if result.scalar_one_or_none() is None:
+            logger.warning(f"Resend activation attempt for non-existent user: {email}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
 
-    if user.is_active:
         logger.info(f"Resend activation attempt for already active account: {email}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Account is already activated",
         )
 
-    # Generate new activation token
-    new_token = generate_activation_token()
-    expiry = datetime.utcnow() + timedelta(days=7)
-
-    await db.execute(
-        update(User)
-        .where(User.id == user.id)
-        .values(activation_token=new_token, activation_token_expiry=expiry)
-    )
     await db.commit()
 
     # TODO: Send activation email with new token
@@ -386,18 +439,23 @@ async def social_signup(
     Returns:
         JWT tokens for authentication
     """
-    logger.info(f"Social {request.provider} signup/login for email: {request.email}")
-
-    # Check if user already exists (by email or provider_user_id)
+    provider = request.provider.value
+    logger.info(f"Social {provider} signup/login for email: {request.email}")
+
+    # Check if user already exists (by email, else by provider and its user id).
+    # One UNION ALL arm per unique index instead of an OR across both.
+    columns = (User.id, User.email, User.role, User.auth_provider)
+    by_email = select(*columns, literal(0).label("match_rank")).where(
+        User.email == request.email
+    )
+    by_provider = select(*columns, literal(1).label("match_rank")).where(
+        User.auth_provider == provider,
+        User.provider_user_id == request.provider_user_id,
+    )
     result = await db.execute(
-        select(User).where(
-            or_(
-                User.email == request.email,
-                User.provider_user_id == request.provider_user_id,
-            )
-        )
+        union_all(by_email, by_provider).order_by("match_rank").limit(1)
     )
-    user = result.scalar_one_or_none()
+    user = result.first()
 
     if user:
         # User exists - log them in
@@ -406,49 +464,50 @@ async def social_signup(
         # Update provider info and password if provided
         update_values = {}
         if not user.auth_provider:
-            update_values["auth_provider"] = request.provider
+            update_values["auth_provider"] = provider
             update_values["provider_user_id"] = request.provider_user_id
             update_values["is_active"] = True
 
         # Set password if provided (enables hybrid auth)
         if request.password:
-            hashed_password = get_password_hash(request.password)
+            hashed_password = await aget_password_hash(request.password)
             update_values["password"] = hashed_password
             logger.info(f"Password set for social user: {request.email}")
 
+        # Email and role are untouched, so the selected row stays accurate
         if update_values:
             await db.execute(
                 update(User).where(User.id == user.id).values(**update_values)
             )
             await db.commit()
-            await db.refresh(user)
     else:
         # Create new user
-        logger.info(f"Creating new user via {request.provider}: {request.email}")
+        logger.info(f"Creating new user via {provider}: {request.email}")
 
         # Hash password if provided
         hashed_password = None
         if request.password:
-            hashed_password = get_password_hash(request.password)
+            hashed_password = await aget_password_hash(request.password)
             logger.info(f"Password set during social signup: {request.email}")
 
         user = User(
             full_name=request.full_name,
             email=request.email,
             phone_number=request.phone_number
-            or f"+234{datetime.utcnow().timestamp():.0f}",  # Placeholder
+            or f"+234{int(time.time())}",  # Placeholder
             role=request.role,
             city=request.city,
-            auth_provider=request.provider,
+            auth_provider=provider,
             provider_user_id=request.provider_user_id,
             password=hashed_password,  # Optional password for hybrid auth
             is_active=True,  # Social users are auto-activated
             email_confirmed=True,  # Email verified by OAuth provider
         )
 
+        # The INSERT's RETURNING populates the id; no refresh needed
         db.add(user)
         await db.commit()
-        await db.refresh(user)
+        await invalidate_signup_metrics()
 
         logger.info(f"New user created via social login: {request.email}")
 
@@ -462,9 +521,12 @@ async def social_signup(
     await db.execute(
         update(User)
         .where(User.id == user.id)
-        .values(refresh_token=refresh_token, last_login=datetime.utcnow())
+        .values(refresh_token_hash=hash_token(refresh_token), last_login=func.now())
     )
     await db.commit()
+    await cache_access_token(
+        user.email, access_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
 
     logger.info(f"Social authentication successful for user: {request.email}")
 
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 from fastapi import APIRouter, status
 from sqlalchemy import text
@@ -8,6 +8,9 @@ from app.config import settings
 router = APIRouter(prefix="/api/v1/health")
 logger = logging.getLogger(__name__)
 
+# PostGIS version cannot change while the process runs; looked up once
+_postgis_version: str | None = None
+
 
 @router.get(
     "",
@@ -25,6 +28,8 @@ async def health_check(db: DBSessionDep) -> dict:
         - Timestamp
         - Version
     """
+    global _postgis_version
+
     db_status = "healthy"
     db_message = "Connected"
 
@@ -32,10 +37,11 @@ async def health_check(db: DBSessionDep) -> dict:
         # Test database connection
         await db.execute(text("SELECT 1"))
 
-        # Test PostGIS extension
-        result = await db.execute(text("SELECT PostGIS_version()"))
-        postgis_version = result.scalar_one()
-        db_message = f"Connected (PostGIS: {postgis_version})"
+        # Test PostGIS extension (first successful check only)
+        if _postgis_version is None:
+            result = await db.execute(text("SELECT PostGIS_version()"))
+            _postgis_version = result.scalar_one()
+        db_message = f"Connected (PostGIS: {_postgis_version})"
         logger.debug("Database health check passed")
 
     except Exception as e:
@@ -45,7 +51,7 @@ async def health_check(db: DBSessionDep) -> dict:
 
     return {
         "status": "healthy" if db_status == "healthy" else "degraded",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": settings.VERSION,
         "service": settings.PROJECT_NAME,
         "database": {"status": db_status, "message": db_message},
@@ -66,6 +72,6 @@ async def ping() -> dict:
     """
     return {
         "status": "ok",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "message": "pong",
     }
@@ -1,8 +1,7 @@
 """User endpoints for registration, authentication, and profile management."""
 
-from datetime import datetime
-from fastapi import APIRouter, status, BackgroundTasks, HTTPException
-from sqlalchemy import select, update
+from fastapi import APIRouter, status, BackgroundTasks, HTTPException, Response
+from sqlalchemy import update
 from app.api.deps import DBSessionDep, CurrentActiveUserDep
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
@@ -13,13 +12,10 @@ from app.schemas.auth import (
     LoginRequest,
 )
 from app.services.user_service import create_user
-from app.core.security import (
-    verify_password,
-    create_access_token,
-    create_refresh_token,
-)
+from app.services.auth_service import login_with_password
+from app.core.queue import enqueue_confirmation_email
+from app.core.analytics import invalidate_signup_metrics
 from app.core.logging import get_logger
-from app.config import settings
 
 logger = get_logger(__name__)
 
@@ -49,9 +45,8 @@ async def register_user(
     - **password**: Strong password
     """
     try:
-        return await create_user(
-            data=signup_data, db=db, background_tasks=background_tasks
-        )
+        new_user = await create_user(data=signup_data, db=db)
+        await db.commit()
     except ValueError as ve:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
     except Exception:
@@ -60,6 +55,17 @@ async def register_user(
             detail="An unexpected error occurred during signup",
         )
 
+    # Only refresh metrics and queue the email once the user is committed
+    await invalidate_signup_metrics()
+    await enqueue_confirmation_email(
+        background_tasks,
+        to_email=new_user.email,
+        full_name=new_user.full_name,
+        role=new_user.role.value,
+    )
+
+    return new_user
+
 
 @router.post(
     "/login",
@@ -77,64 +83,20 @@ async def login_user(
     - **email**: User email address
     - **password**: User password
     """
-    logger.info(f"Login attempt for email: {login_data.email}")
-
-    # Fetch user by email
-    result = await db.execute(select(User).where(User.email == login_data.email))
-    user = result.scalar_one_or_none()
-
-    # Verify user exists and has a password (local account)
-    if (
-        not user
-        or not user.password
-        or not verify_password(login_data.password, user.password)
-    ):
-        logger.warning(f"Failed login attempt for email: {login_data.email}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Check if account is activated
-    if not user.is_active:
-        logger.warning(f"Inactive account login attempt: {login_data.email}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account not activated. Please check your email for activation instructions.",
-        )
-
-    # Create tokens
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    refresh_token = create_refresh_token(data={"sub": user.email})
-
-    # Update user's refresh token and last login
-    await db.execute(
-        update(User)
-        .where(User.id == user.id)
-        .values(refresh_token=refresh_token, last_login=datetime.utcnow())
-    )
-    await db.commit()
-
-    logger.info(f"Successful login for user: {login_data.email}")
-
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    return await login_with_password(login_data, db)
 
 
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_current_user_profile(
     current_user: CurrentActiveUserDep,
-) -> UserResponse:
+) -> Response:
     """Get current authenticated user's profile."""
     logger.info(f"Profile fetch for user: {current_user.email}")
-    return UserResponse.model_validate(current_user)
+    # The dependency already loaded the row; serialize it straight to JSON
+    return Response(
+        content=UserResponse.model_validate(current_user).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.patch("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
@@ -147,17 +109,27 @@ async def update_current_user_profile(
     logger.info(f"Profile update for user: {current_user.email}")
 
     update_dict = update_data.model_dump(exclude_unset=True)
+    # Drop fields the client re-sent unchanged
+    update_dict = {
+        field: value
+        for field, value in update_dict.items()
+        if getattr(current_user, field) != value
+    }
 
     if not update_dict:
         return UserResponse.model_validate(current_user)
 
-    await db.execute(
-        update(User).where(User.id == current_user.id).values(**update_dict)
+    result = await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(**update_dict)
+        .returning(User)
+        .execution_options(populate_existing=True)
     )
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(current_user)
 
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(user)
 
 
 @router.delete("/me", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -171,7 +143,7 @@ async def deactivate_account(
     await db.execute(
         update(User)
         .where(User.id == current_user.id)
-        .values(is_active=False, refresh_token=None)
+        .values(is_active=False, refresh_token_hash=None)
     )
     await db.commit()
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +24,17 @@ class Settings(BaseSettings):
         description="Async PostgreSQL connection string",
     )
     DATABASE_ECHO: bool = Field(default=False, description="Log SQL queries")
+    # Per process: 4 workers x (10 + 10) stays under PostgreSQL's default
+    # max_connections of 100
+    DATABASE_POOL_SIZE: int = Field(
+        default=10, description="Connections kept open in the pool"
+    )
+    DATABASE_MAX_OVERFLOW: int = Field(
+        default=10, description="Extra connections allowed beyond the pool size"
+    )
+    DATABASE_POOL_RECYCLE: int = Field(
+        default=1800, description="Seconds before a pooled connection is replaced"
+    )
 
     # Admin Authentication
     ADMIN_USERNAME: str = Field(default="admin")
@@ -40,6 +52,13 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(
         default=7, description="Refresh token expiry"
     )
+    BCRYPT_ROUNDS: int = Field(
+        default=12, ge=4, le=31, description="bcrypt work factor (log2 rounds)"
+    )
+    REFRESH_REUSE_THRESHOLD_SECONDS: int = Field(
+        default=60,
+        description="Reuse current tokens on refresh while they have more than this many seconds left",
+    )
 
     # Redis Configuration
     REDIS_URL: str = Field(
@@ -54,6 +73,9 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = Field(default="")
     SMTP_FROM_EMAIL: str = Field(default="noreply@restockr.ng")
     SMTP_FROM_NAME: str = Field(default="ReStockr Team")
+    SMTP_POOL_SIZE: int = Field(
+        default=2, description="SMTP connections kept open for reuse"
+    )
 
     # Phone Validation
     DEFAULT_COUNTRY_CODE: str = Field(
@@ -69,9 +91,20 @@ class Settings(BaseSettings):
         ]
     )
 
+    # Admin analytics
+    ANALYTICS_CACHE_TTL: int = Field(
+        default=60, ge=1, description="Seconds to cache signup analytics results"
+    )
+
     # Pagination
     DEFAULT_PAGE_SIZE: int = Field(default=50)
     MAX_PAGE_SIZE: int = Field(default=500)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment and .env once per process."""
+    return Settings()
+
+
+settings = get_settings()
@@ -2,15 +2,46 @@
 Analytics and metrics tracking for signups.
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from sqlalchemy import select, func, and_, extract
+import orjson
+from sqlalchemy import select, func, Row, Select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
 from app.models.user import User, UserRole
+from app.helpers.user_helpers import select_user
+from app.core.redis import get_cached_value, set_cached_value, delete_cached_values
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Cached admin metrics derived from the users table
+STATS_CACHE_KEY = "admin:stats:v1"
+STATS_CACHE_TTL = 10
+USERS_TOTAL_CACHE_KEY = "admin:users:total"
+USERS_TOTAL_CACHE_TTL = 10
+ANALYTICS_CACHE_PREFIX = "analytics:v1:"
+
+
+async def invalidate_signup_metrics() -> None:
+    """
+    Drop cached metrics that change when a user signs up.
+
+    Analytics are left alone: their keys are bucketed by time and expire
+    within ANALYTICS_CACHE_TTL seconds.
+    """
+    await delete_cached_values(STATS_CACHE_KEY, USERS_TOTAL_CACHE_KEY)
+
+
+async def _fetch_all(query: Select) -> list[Row]:
+    """Run a read-only query on its own session and return all rows."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        return list(result.all())
+
 
 async def get_signup_analytics(db: AsyncSession, days: int = 30) -> Dict:
     """
@@ -21,7 +52,7 @@ async def get_signup_analytics(db: AsyncSession, days: int = 30) -> Dict:
         days: Number of days to analyze (default: 30)
 
     Returns:
-        Dictionary with analytics data
+        Dictionary with analytics data; dates are left for orjson to encode
     """
     logger.info(f"Generating signup analytics for last {days} days")
 
@@ -29,73 +60,62 @@ async def get_signup_analytics(db: AsyncSession, days: int = 30) -> Dict:
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
-    # Total signups in period
-    total_result = await db.execute(
-        select(func.count(User.id)).where(User.created_at >= start_date)
-    )
-    total_signups = total_result.scalar_one()
-
-    # Signups by role
-    role_stats = {}
-    for role in UserRole:
-        role_result = await db.execute(
-            select(func.count(User.id)).where(
-                and_(
-                    User.role == role,
-                    User.created_at >= start_date,
-                )
-            )
-        )
-        role_stats[role.value] = role_result.scalar_one()
+    # Period totals, previous-period total, confirmations and per-role
+    # counts in one scan of the two windows
+    previous_start = start_date - timedelta(days=days)
+    in_period = User.created_at >= start_date
+    summary_query = select(
+        func.count().filter(in_period).label("total"),
+        func.count().filter(User.created_at < start_date).label("previous"),
+        func.count().filter(in_period, User.email_confirmed == True).label("confirmed"),
+        *(
+            func.count().filter(in_period, User.role == role).label(role.value)
+            for role in UserRole
+        ),
+    ).where(User.created_at >= previous_start)
 
     # Signups by city
-    city_result = await db.execute(
-        select(User.city, func.count(User.id).label("count"))
+    city_query = (
+        select(User.city, func.count().label("count"))
         .where(User.created_at >= start_date)
         .group_by(User.city)
-        .order_by(func.count(User.id).desc())
+        .order_by(func.count().desc())
     )
-    city_stats = {city: count for city, count in city_result.all()}
 
     # Daily signup trend
-    daily_result = await db.execute(
+    daily_query = (
         select(
             func.date(User.created_at).label("date"),
-            func.count(User.id).label("count"),
+            func.count().label("count"),
         )
         .where(User.created_at >= start_date)
         .group_by(func.date(User.created_at))
         .order_by(func.date(User.created_at))
     )
-    daily_trend = [
-        {"date": str(date), "count": count} for date, count in daily_result.all()
-    ]
 
-    # Email confirmation rate
-    confirmed_result = await db.execute(
-        select(func.count(User.id)).where(
-            and_(
-                User.email_confirmed == True,
-                User.created_at >= start_date,
-            )
-        )
+    # Independent queries run concurrently; an AsyncSession cannot be shared
+    # between them, so the breakdowns use their own short-lived sessions
+    summary_result, city_rows, daily_rows = await asyncio.gather(
+        db.execute(summary_query),
+        _fetch_all(city_query),
+        _fetch_all(daily_query),
     )
-    confirmed_count = confirmed_result.scalar_one()
+
+    summary = summary_result.one()._mapping
+    total_signups = summary["total"]
+    previous_signups = summary["previous"]
+    confirmed_count = summary["confirmed"]
+    role_stats = {role.value: summary[role.value] for role in UserRole}
+    city_stats = {city: count for city, count in city_rows}
+    # Dates stay as date objects; orjson writes them as ISO 8601
+    daily_trend = [{"date": date, "count": count} for date, count in daily_rows]
+
+    # Email confirmation rate
     confirmation_rate = (
         (confirmed_count / total_signups * 100) if total_signups > 0 else 0
     )
 
     # Growth rate (compare with previous period)
-    previous_start = start_date - timedelta(days=days)
-    previous_result = await db.execute(
-        select(func.count(User.id)).where(
-            and_(
-                User.created_at >= previous_start,
-                User.created_at < start_date,
-            )
-        )
-    )
-    previous_signups = previous_result.scalar_one()
     growth_rate = (
         ((total_signups - previous_signups) / previous_signups * 100)
         if previous_signups > 0
@@ -106,8 +126,8 @@ async def get_signup_analytics(db: AsyncSession, days: int = 30) -> Dict:
 
     return {
         "period": {
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
+            "start_date": start_date,
+            "end_date": end_date,
             "days": days,
         },
         "total_signups": total_signups,
@@ -123,6 +143,32 @@ async def get_signup_analytics(db: AsyncSession, days: int = 30) -> Dict:
     }
 
 
+async def get_signup_analytics_json(db: AsyncSession, days: int = 30) -> bytes:
+    """
+    Get signup analytics as JSON, cached in Redis.
+
+    Results are cached per number of days within a time bucket of
+    ANALYTICS_CACHE_TTL seconds, so repeated dashboard polls reuse them.
+
+    Args:
+        db: Database session
+        days: Number of days to analyze (default: 30)
+
+    Returns:
+        JSON-encoded analytics data
+    """
+    ttl = settings.ANALYTICS_CACHE_TTL
+    key = f"{ANALYTICS_CACHE_PREFIX}{days}:{int(time.time()) // ttl}"
+
+    cached = await get_cached_value(key)
+    if cached is not None:
+        return cached.encode()
+
+    body = orjson.dumps(await get_signup_analytics(db, days=days))
+    await set_cached_value(key, body, ttl)
+    return body
+
+
 async def get_recent_signups(db: AsyncSession, limit: int = 10) -> List[User]:
     """
     Get most recent signups.
@@ -135,6 +181,6 @@ async def get_recent_signups(db: AsyncSession, limit: int = 10) -> List[User]:
         List of recent signup records
     """
     result = await db.execute(
-        select(User).order_by(User.created_at.desc()).limit(limit)
+        select_user().order_by(User.created_at.desc()).limit(limit)
     )
     return result.scalars().all()
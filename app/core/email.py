@@ -1,5 +1,7 @@
 from typing import Optional
+import asyncio
 import logging
+from string import Template
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import aiosmtplib
@@ -7,47 +9,22 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+_FROM_HEADER = f"{settings.SMTP_FROM_NAME} <{settings.SMTP_FROM_EMAIL}>"
 
-async def send_confirmation_email(to_email: str, full_name: str, role: str) -> bool:
-    """
-    Send confirmation email to early access signup.
-
-    Args:
-        to_email: Recipient email address
-        full_name: Recipient's full name
-        role: User role (customer, vendor, rider)
-
-    Returns:
-        True if email sent successfully, False otherwise
-    """
-    # Skip if SMTP not configured
-    if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
-        logger.warning(
-            f"SMTP not configured. Skipping confirmation email to {to_email}"
-        )
-        return False
-
-    try:
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = f"Welcome to ReStockr Early Access - {role.capitalize()}"
-        message["From"] = f"{settings.SMTP_FROM_NAME} <{settings.SMTP_FROM_EMAIL}>"
-        message["To"] = to_email
-
-        # Create HTML content
-        html_content = f"""
+# Confirmation email body, parsed once at import
+_HTML_TEMPLATE = Template("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                          color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .footer {{ text-align: center; margin-top: 20px; color: #888; font-size: 12px; }}
-                .role-badge {{ display: inline-block; background: #667eea; color: white; 
-                              padding: 5px 15px; border-radius: 20px; font-weight: bold; }}
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                          color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+                .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+                .footer { text-align: center; margin-top: 20px; color: #888; font-size: 12px; }
+                .role-badge { display: inline-block; background: #667eea; color: white; 
+                              padding: 5px 15px; border-radius: 20px; font-weight: bold; }
             </style>
         </head>
         <body>
@@ -56,10 +33,10 @@ async def send_confirmation_email(to_email: str, full_name: str, role: str) -> b
                     <h1>🎉 Welcome to ReStockr!</h1>
                 </div>
                 <div class="content">
-                    <p>Hi {full_name},</p>
+                    <p>Hi $full_name,</p>
                     
                     <p>Thank you for joining the <strong>ReStockr Early Access</strong> program as a 
-                    <span class="role-badge">{role.upper()}</span>!</p>
+                    <span class="role-badge">$role_upper</span>!</p>
                     
                     <p>We're building Nigeria's first hyper-local restocking platform, and you're among 
                     the first to experience it when we launch in <strong>Abuja</strong>.</p>
@@ -85,15 +62,25 @@ async def send_confirmation_email(to_email: str, full_name: str, role: str) -> b
             </div>
         </body>
         </html>
-        """
+        """)
 
-        # Attach HTML content
-        html_part = MIMEText(html_content, "html")
-        message.attach(html_part)
 
-        # Send email
-        await aiosmtplib.send(
-            message,
+class SMTPPool:
+    """
+    Keep authenticated SMTP connections open between emails.
+
+    Connections are opened lazily, up to ``size``, and handed out one
+    message at a time. A connection the server has dropped is reconnected
+    and the message retried once.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: Optional[asyncio.Queue] = None
+        self._created = 0
+
+    def _new_client(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
             hostname=settings.SMTP_HOST,
             port=settings.SMTP_PORT,
             username=settings.SMTP_USER,
@@ -101,6 +88,93 @@ async def send_confirmation_email(to_email: str, full_name: str, role: str) -> b
             start_tls=True,
         )
 
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            return self._new_client()
+        return await self._idle.get()
+
+    async def send_message(self, message: MIMEMultipart) -> None:
+        """Send a message over a pooled connection, connecting if needed."""
+        client = await self._acquire()
+        try:
+            for attempt in range(2):
+                if not client.is_connected:
+                    # connect() performs STARTTLS and AUTH
+                    await client.connect()
+                try:
+                    await client.send_message(message)
+                    return
+                except aiosmtplib.SMTPServerDisconnected:
+                    if attempt:
+                        raise
+                    logger.info("SMTP connection dropped, reconnecting")
+        finally:
+            self._idle.put_nowait(client)
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+        self._created = 0
+
+
+smtp_pool = SMTPPool(settings.SMTP_POOL_SIZE)
+
+
+async def close_smtp_pool() -> None:
+    """Close pooled SMTP connections."""
+    await smtp_pool.close()
+    logger.info("✅ SMTP connections closed")
+
+
+async def send_confirmation_email(to_email: str, full_name: str, role: str) -> bool:
+    """
+    Send confirmation email to early access signup.
+
+    Args:
+        to_email: Recipient email address
+        full_name: Recipient's full name
+        role: User role (customer, vendor, rider)
+
+    Returns:
+        True if email sent successfully, False otherwise
+    """
+    # Skip if SMTP not configured
+    if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+        logger.warning(
+            f"SMTP not configured. Skipping confirmation email to {to_email}"
+        )
+        return False
+
+    try:
+        # Create message
+        message = MIMEMultipart("alternative")
+        message["Subject"] = f"Welcome to ReStockr Early Access - {role.capitalize()}"
+        message["From"] = _FROM_HEADER
+        message["To"] = to_email
+
+        # Create HTML content
+        html_content = _HTML_TEMPLATE.substitute(
+            full_name=full_name, role_upper=role.upper()
+        )
+
+        # Attach HTML content
+        html_part = MIMEText(html_content, "html")
+        message.attach(html_part)
+
+        # Send email over a reused connection
+        await smtp_pool.send_message(message)
+
         logger.info(f"Confirmation email sent successfully to {to_email}")
         return True
 
@@ -5,8 +5,12 @@ Provides uvicorn-style logging with colored output and proper formatting.
 """
 
 import logging
+import os
+import queue
+import re
 import sys
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
 # ANSI color codes for terminal output
 COLORS = {
@@ -28,6 +32,10 @@ EMOJI = {
 }
 
 
+# Matches the ANSI color escapes above, for plain output when not on a TTY
+_ANSI_CODE = re.compile(r"\033\[\d+m")
+
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors and emojis matching uvicorn style."""
 
@@ -60,32 +68,71 @@ class UvicornStyleFormatter(logging.Formatter):
         logging.CRITICAL: "\033[35mCRITICAL\033[0m: %(message)s",
     }
 
+    def __init__(self, use_colors: Optional[bool] = None) -> None:
+        """
+        Build one formatter per level up front.
+
+        Args:
+            use_colors: Emit ANSI colors; defaults to whether stdout is a TTY
+        """
+        super().__init__()
+        if use_colors is None:
+            use_colors = sys.stdout.isatty()
+
+        self._formatters = {
+            level: logging.Formatter(fmt if use_colors else _ANSI_CODE.sub("", fmt))
+            for level, fmt in self.FORMATS.items()
+        }
+        self._default = logging.Formatter("%(levelname)s: %(message)s")
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record in uvicorn style."""
-        log_fmt = self.FORMATS.get(record.levelno, "%(levelname)s: %(message)s")
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default).format(record)
+
+
+# Background thread writing queued log records to stdout, and the root
+# handler feeding it
+_log_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
 
 
 def setup_logging(log_level: str = "INFO") -> None:
     """
     Configure application logging.
 
+    Log calls only enqueue the record; a QueueListener thread formats it
+    and writes it to stdout, so a slow consumer cannot block the event loop.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _log_listener, _queue_handler
+
     # Convert string to logging level
     level = getattr(logging, log_level.upper(), logging.INFO)
 
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(UvicornStyleFormatter())
+    console_handler.setFormatter(UvicornStyleFormatter(use_colors=sys.stdout.isatty()))
+
+    # Replace any listener from an earlier call
+    stop_logging()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+
+    # The queue handler only merges args and tracebacks into the message;
+    # the listener's handler applies the real format
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
     # Configure root logger
     logging.basicConfig(
         level=level,
-        handlers=[console_handler],
+        handlers=[_queue_handler],
         force=True,
     )
 
@@ -96,6 +143,48 @@ def setup_logging(log_level: str = "INFO") -> None:
     logging.getLogger("asyncpg").setLevel(logging.WARNING)
 
 
+def stop_logging() -> None:
+    """
+    Flush queued log records and stop the listener thread.
+
+    Later records are written by the console handler directly, so nothing
+    logged during shutdown is lost.
+    """
+    global _log_listener, _queue_handler
+
+    if _log_listener:
+        _log_listener.stop()
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        for handler in _log_listener.handlers:
+            root.addHandler(handler)
+        _log_listener = None
+        _queue_handler = None
+
+
+def _restart_listener_in_child() -> None:
+    """
+    Give a forked worker its own queue and listener thread.
+
+    Threads do not survive fork, so without this a child started from a
+    preloaded app (gunicorn --preload) would enqueue records nobody reads.
+    """
+    global _log_listener
+
+    if _log_listener is None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _log_listener = QueueListener(
+        log_queue, *_log_listener.handlers, respect_handler_level=True
+    )
+    _log_listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a module.
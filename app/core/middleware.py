@@ -2,98 +2,117 @@
 Middleware for request logging and tracking.
 """
 
+import itertools
+import os
 import time
 import logging
-import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+# Request IDs: 4 hex digits of the PID followed by a per-process counter
+_request_counter = itertools.count()
+_pid_prefix = f"{os.getpid() & 0xFFFF:04x}"
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests with timing and request IDs."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and log details.
+def _reset_request_ids() -> None:
+    """Give a forked worker its own PID prefix and counter."""
+    global _request_counter, _pid_prefix
+    _request_counter = itertools.count()
+    _pid_prefix = f"{os.getpid() & 0xFFFF:04x}"
 
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/route handler
 
-        Returns:
-            HTTP response
-        """
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
+os.register_at_fork(after_in_child=_reset_request_ids)
 
-        # Log incoming request
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path} "
-            f"from {request.client.host if request.client else 'unknown'}"
-        )
 
-        # Track request timing
-        start_time = time.time()
+def _format_duration(duration_ns: int) -> str:
+    """Format nanoseconds as milliseconds with two decimals, e.g. "12.34ms"."""
+    centi_ms = duration_ns // 10_000
+    return f"{centi_ms // 100}.{centi_ms % 100:02d}ms"
 
-        try:
-            # Process request
-            response = await call_next(request)
 
-            # Calculate duration
-            duration = time.time() - start_time
-            duration_ms = round(duration * 1000, 2)
+# Added to every HTTP response
+_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
 
-            # Log response
-            logger.info(
-                f"[{request_id}] {request.method} {request.url.path} "
-                f"completed with status {response.status_code} in {duration_ms}ms"
-            )
 
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = f"{duration_ms}ms"
+class ObservabilityMiddleware:
+    """
+    Log HTTP requests with timing and request IDs, and add security headers.
 
-            return response
+    Implemented as plain ASGI rather than BaseHTTPMiddleware, so a request
+    passes through one wrapper around ``send`` instead of a call_next task
+    and response stream per middleware.
+    """
 
-        except Exception as e:
-            # Log errors
-            duration = time.time() - start_time
-            duration_ms = round(duration * 1000, 2)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-            logger.error(
-                f"[{request_id}] {request.method} {request.url.path} "
-                f"failed after {duration_ms}ms: {str(e)}"
-            )
-            raise
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Process request and log details.
 
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to responses."""
+        # Generate unique request ID, exposed as request.state.request_id
+        request_id = f"{_pid_prefix}{next(_request_counter) & 0xFFFFFFFF:08x}"
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        path = scope["path"]
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Add security headers to response.
+        # Log incoming request
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            client = scope.get("client")
+            logger.info(
+                f"[{request_id}] {method} {path} "
+                f"from {client[0] if client else 'unknown'}"
+            )
 
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/route handler
+        # Track request timing
+        start_ns = time.perf_counter_ns()
+        status_code = 0
+        duration = ""
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, duration
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = _format_duration(time.perf_counter_ns() - start_ns)
+
+                # Add request ID, timing and security headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = duration
+                headers.update(_SECURITY_HEADERS)
+            await send(message)
 
-        Returns:
-            HTTP response with security headers
-        """
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            # Log errors
+            duration = _format_duration(time.perf_counter_ns() - start_ns)
 
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
+            logger.error(
+                f"[{request_id}] {method} {path} failed after {duration}: {str(e)}"
+            )
+            raise
 
-        return response
+        # Log response
+        if log_info:
+            logger.info(
+                f"[{request_id}] {method} {path} "
+                f"completed with status {status_code} in {duration}"
+            )
@@ -0,0 +1,72 @@
+"""Redis-backed job queue (arq) for work that should not run in the API process."""
+
+from typing import Optional
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+from fastapi import BackgroundTasks
+from app.config import settings
+from app.core.email import send_confirmation_email
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# arq connection pool used to enqueue jobs
+job_queue: Optional[ArqRedis] = None
+
+
+async def init_queue() -> None:
+    """Initialize the job queue connection."""
+    global job_queue
+
+    try:
+        job_queue = await create_pool(RedisSettings.from_dsn(settings.REDIS_URL))
+        logger.info("✅ Job queue connected")
+    except Exception as e:
+        logger.error(f"❌ Job queue connection failed: {e}")
+        logger.warning("⚠️  Emails will be sent from the API process instead")
+        job_queue = None
+
+
+async def close_queue() -> None:
+    """Close the job queue connection."""
+    global job_queue
+
+    if job_queue:
+        try:
+            await job_queue.aclose()
+            logger.info("✅ Job queue connection closed")
+        except Exception as e:
+            logger.error(f"❌ Error closing job queue: {e}")
+        finally:
+            job_queue = None
+
+
+async def enqueue_confirmation_email(
+    background_tasks: BackgroundTasks, to_email: str, full_name: str, role: str
+) -> None:
+    """
+    Queue a signup confirmation email for the worker.
+
+    Falls back to a FastAPI background task when the queue is unavailable.
+
+    Args:
+        background_tasks: Request background tasks used as a fallback
+        to_email: Recipient email address
+        full_name: Recipient's full name
+        role: User role (customer, vendor, rider)
+    """
+    if job_queue:
+        try:
+            await job_queue.enqueue_job(
+                "send_confirmation_email",
+                to_email=to_email,
+                full_name=full_name,
+                role=role,
+            )
+            return
+        except Exception as e:
+            logger.error(f"Failed to enqueue confirmation email: {e}")
+
+    background_tasks.add_task(
+        send_confirmation_email, to_email=to_email, full_name=full_name, role=role
+    )
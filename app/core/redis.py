@@ -1,16 +1,100 @@
 """Redis client for token blacklisting and caching."""
 
+import asyncio
 from redis import asyncio as aioredis
 from redis.asyncio import Redis
 from typing import Optional
+from cachetools import TTLCache
 from app.config import settings
 from app.core.logging import get_logger
+from app.core.security import hash_token
 
 logger = get_logger(__name__)
 
 # Redis client instance
 redis_client: Optional[Redis] = None
 
+# Per-process memo of blacklist lookups, keyed by hash_token(token).
+# Revocations from other workers arrive over BLACKLIST_CHANNEL; the TTL
+# bounds staleness if a message is missed.
+BLACKLIST_CACHE_TTL_SECONDS = 30
+_blacklist_cache: TTLCache = TTLCache(maxsize=10000, ttl=BLACKLIST_CACHE_TTL_SECONDS)
+
+# Pub/sub channel carrying hash_token(token).hex() of each revoked token
+BLACKLIST_CHANNEL = "blacklist:revoked"
+_blacklist_listener: Optional[asyncio.Task] = None
+
+
+def _blacklist_key(token_key: bytes) -> str:
+    """Redis key for a revoked token: a 128-bit prefix of its SHA-256 digest."""
+    return f"blacklist:{token_key[:16].hex()}"
+
+
+# How long a blacklist lookup waits for concurrent lookups to share its round trip
+BLACKLIST_BATCH_WINDOW_SECONDS = 0.002
+
+
+class BlacklistBatcher:
+    """Coalesce blacklist lookups from concurrent requests into one pipeline."""
+
+    def __init__(self, window: float = BLACKLIST_BATCH_WINDOW_SECONDS) -> None:
+        self.window = window
+        self._pending: dict[bytes, tuple[str, asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def check(self, token_key: bytes, token: str) -> bool:
+        """
+        Check a token against the Redis blacklist as part of the next batch.
+
+        Args:
+            token_key: hash_token(token)
+            token: JWT token, used for the legacy full-token key
+
+        Returns:
+            bool: True if blacklisted, False otherwise
+        """
+        entry = self._pending.get(token_key)
+        if entry is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[token_key] = (token, future)
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush())
+        else:
+            future = entry[1]
+
+        # Shield so one cancelled request cannot fail the others sharing it
+        return await asyncio.shield(future)
+
+    async def _flush(self) -> None:
+        """Send every pending lookup in one pipeline and resolve the waiters."""
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for token_key, (token, _) in pending.items():
+                    # Also probe the legacy full-token key; such entries expire
+                    # within one access-token lifetime of upgrading
+                    pipe.exists(_blacklist_key(token_key), f"blacklist:{token}")
+                results = await pipe.execute()
+        except Exception as e:
+            for _, future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), count in zip(pending.values(), results):
+            if not future.done():
+                future.set_result(bool(count))
+
+
+_blacklist_batcher = BlacklistBatcher()
+
+
+# Most recently issued access token per user, reused by /auth/refresh
+ACCESS_TOKEN_CACHE_PREFIX = "auth:access:"
+
 
 async def init_redis() -> None:
     """Initialize Redis connection."""
@@ -28,6 +112,9 @@ async def init_redis() -> None:
         # Ensure connection is alive; ping is async for aioredis client
         await redis_client.ping()
         logger.info(f"✅ Redis connected: {settings.REDIS_URL}")
+
+        global _blacklist_listener
+        _blacklist_listener = asyncio.create_task(_listen_for_revocations())
     except Exception as e:
         logger.error(f"❌ Redis connection failed: {e}")
         logger.warning("⚠️  Token blacklisting will not be available")
@@ -36,7 +123,15 @@ async def init_redis() -> None:
 
 async def close_redis() -> None:
     """Close Redis connection."""
-    global redis_client
+    global redis_client, _blacklist_listener
+
+    if _blacklist_listener:
+        _blacklist_listener.cancel()
+        try:
+            await _blacklist_listener
+        except asyncio.CancelledError:
+            pass
+        _blacklist_listener = None
 
     if redis_client:
         try:
@@ -59,13 +154,19 @@ async def blacklist_token(token: str, expires_in: int) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
+    # Revocation is visible to this worker immediately
+    token_key = hash_token(token)
+    _blacklist_cache[token_key] = True
+
     if not redis_client:
         logger.warning("Redis not available, token not blacklisted")
         return False
 
     try:
-        key = f"blacklist:{token}"
-        await redis_client.setex(key, expires_in, "1")
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(_blacklist_key(token_key), expires_in, "1")
+            pipe.publish(BLACKLIST_CHANNEL, token_key.hex())
+            await pipe.execute()
         logger.debug(f"Token blacklisted (expires in {expires_in}s)")
         return True
     except Exception as e:
@@ -83,18 +184,151 @@ async def is_token_blacklisted(token: str) -> bool:
     Returns:
         bool: True if blacklisted, False otherwise
     """
+    token_key = hash_token(token)
+    cached = _blacklist_cache.get(token_key)
+    if cached is not None:
+        return cached
+
     if not redis_client:
         return False
 
     try:
-        key = f"blacklist:{token}"
-        result = await redis_client.exists(key)
-        return bool(result)
+        result = await _blacklist_batcher.check(token_key, token)
+        # A revocation may have landed while we waited; never overwrite it
+        if result or token_key not in _blacklist_cache:
+            _blacklist_cache[token_key] = result
+        return result
     except Exception as e:
         logger.error(f"Failed to check token blacklist: {e}")
         return False
 
 
+async def _listen_for_revocations() -> None:
+    """Mirror tokens revoked by other workers into the local blacklist cache."""
+    while redis_client:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(BLACKLIST_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        _blacklist_cache[bytes.fromhex(message["data"])] = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Blacklist subscription failed, retrying: {e}")
+            await asyncio.sleep(1)
+
+
+async def get_cached_value(key: str) -> Optional[str]:
+    """
+    Read a cached value.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Optional[str]: Cached value, or None on a miss or if Redis is unavailable
+    """
+    if not redis_client:
+        return None
+
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.error(f"Failed to read cache key {key}: {e}")
+        return None
+
+
+async def set_cached_value(key: str, value: str | bytes, expires_in: int) -> bool:
+    """
+    Store a value in the cache.
+
+    Args:
+        key: Cache key
+        value: Value to store
+        expires_in: Time to live in seconds
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not redis_client:
+        return False
+
+    try:
+        await redis_client.setex(key, expires_in, value)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to write cache key {key}: {e}")
+        return False
+
+
+async def delete_cached_values(*keys: str) -> bool:
+    """
+    Remove values from the cache.
+
+    Args:
+        keys: Cache keys to delete
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not redis_client or not keys:
+        return False
+
+    try:
+        await redis_client.delete(*keys)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to delete cache keys {keys}: {e}")
+        return False
+
+
+async def cache_access_token(email: str, token: str, expires_in: int) -> bool:
+    """
+    Remember the access token most recently issued to a user.
+
+    Args:
+        email: User email (token subject)
+        token: Encoded access token
+        expires_in: Time to keep the token in seconds
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return await set_cached_value(
+        f"{ACCESS_TOKEN_CACHE_PREFIX}{email}", token, expires_in
+    )
+
+
+async def get_cached_access_token(email: str) -> Optional[str]:
+    """
+    Get the access token most recently issued to a user.
+
+    Args:
+        email: User email (token subject)
+
+    Returns:
+        Optional[str]: Encoded access token, or None if not cached
+    """
+    return await get_cached_value(f"{ACCESS_TOKEN_CACHE_PREFIX}{email}")
+
+
+async def invalidate_access_token(email: str) -> bool:
+    """
+    Forget the cached access token of a user.
+
+    Args:
+        email: User email (token subject)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return await delete_cached_values(f"{ACCESS_TOKEN_CACHE_PREFIX}{email}")
+
+
 def get_redis_client() -> Optional[Redis]:
     """Get the Redis client instance."""
     return redis_client
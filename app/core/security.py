@@ -1,17 +1,104 @@
 """Security utilities for password hashing and JWT token management."""
 
+import base64
+import calendar
+import hashlib
+import hmac
+import os
 import secrets
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import anyio
+import bcrypt
+import orjson
+from cachetools import TLRUCache
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt input limit; longer passwords are truncated
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# Decode results, keyed by hash_token(token); failures map to _INVALID_TOKEN
+DECODE_CACHE_TTL_SECONDS = 30
+_INVALID_TOKEN: Dict[str, Any] = {}
+
+
+def _decode_ttu(key: bytes, payload: Dict[str, Any], now: float) -> float:
+    """Expire cached payloads after the cache TTL or at token expiry."""
+    if payload is _INVALID_TOKEN:
+        return now + DECODE_CACHE_TTL_SECONDS
+    return min(now + DECODE_CACHE_TTL_SECONDS, payload.get("exp", 0))
+
+
+_decode_cache: TLRUCache = TLRUCache(maxsize=10000, ttu=_decode_ttu, timer=time.time)
+
+
+# HMAC algorithms signed directly with a keyed hash prepared at import;
+# anything else (RS*/ES*) goes through jose
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding, as JWS requires."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": settings.ALGORITHM, "typ": "JWT"}))
+_jwt_signer = (
+    hmac.new(settings.SECRET_KEY.encode(), digestmod=_HMAC_DIGESTS[settings.ALGORITHM])
+    if settings.ALGORITHM in _HMAC_DIGESTS
+    else None
+)
+
+
+def _encode_jwt(claims: Dict[str, Any]) -> str:
+    """
+    Sign claims as a compact JWT.
+
+    Args:
+        claims: Claims to encode; datetime values become NumericDate seconds
+
+    Returns:
+        str: Encoded JWT token
+    """
+    if _jwt_signer is None:
+        return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    payload = {
+        name: (
+            calendar.timegm(value.utctimetuple())
+            if isinstance(value, datetime)
+            else value
+        )
+        for name, value in claims.items()
+    }
+    signing_input = f"{_JWT_HEADER_B64}.{_b64url(orjson.dumps(payload))}"
+    signer = _jwt_signer.copy()
+    signer.update(signing_input.encode("ascii"))
+    return f"{signing_input}.{_b64url(signer.digest())}"
+
+
+def hash_token(token: str) -> bytes:
+    """
+    Derive a fixed-size cache key from a token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        bytes: SHA-256 digest of the token
+    """
+    # OpenSSL's SHA-256 uses the CPU's SHA extensions where present, which
+    # beats BLAKE2/BLAKE3 at JWT-sized inputs; keep it for stable Redis keys
+    return hashlib.sha256(token.encode()).digest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -25,7 +112,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES],
+            hashed_password.encode("utf-8"),
+        )
+    except ValueError:
+        logger.warning("Stored password hash is not a valid bcrypt hash")
+        return False
 
 
 def get_password_hash(password: str) -> str:
@@ -38,7 +132,47 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES],
+        bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS),
+    ).decode("utf-8")
+
+
+# bcrypt releases the GIL, so hashing threads run in parallel; cap them at
+# one per core so bursts neither oversubscribe the CPU nor take every slot
+# of anyio's shared thread pool from other blocking work
+_bcrypt_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in a worker thread, keeping bcrypt off the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    return await anyio.to_thread.run_sync(
+        verify_password, plain_password, hashed_password, limiter=_bcrypt_limiter
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """
+    Hash a password in a worker thread, keeping bcrypt off the event loop.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        str: Hashed password
+    """
+    return await anyio.to_thread.run_sync(
+        get_password_hash, password, limiter=_bcrypt_limiter
+    )
 
 
 def create_access_token(
@@ -65,9 +199,7 @@ def create_access_token(
 
     to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = _encode_jwt(to_encode)
     logger.debug(
         f"Created access token for subject: {data.get('sub')} (expires: {expire})"
     )
@@ -97,9 +229,7 @@ def create_refresh_token(
 
     to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = _encode_jwt(to_encode)
     logger.debug(
         f"Created refresh token for subject: {data.get('sub')} (expires: {expire})"
     )
@@ -117,22 +247,30 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Decoded token payload or None if invalid
     """
+    key = hash_token(token)
+    payload = _decode_cache.get(key)
+    if payload is not None:
+        return None if payload is _INVALID_TOKEN else payload
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError as e:
         logger.warning(f"JWT decode error: {e}")
+        _decode_cache[key] = _INVALID_TOKEN
         return None
 
+    _decode_cache[key] = payload
+    return payload
+
 
 def generate_activation_token() -> str:
     """
     Generate a secure random activation token.
 
     Returns:
-        str: Random hex token
+        str: Random URL-safe token (43 characters, 256 bits)
     """
     return secrets.token_urlsafe(32)
 
@@ -12,6 +12,20 @@ engine = create_async_engine(
     echo=settings.DATABASE_ECHO,
     future=True,
     pool_pre_ping=True,  # Verify connections before using
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    # Compiled SQL per statement shape; sized to the asyncpg statement cache
+    # so a statement asyncpg still has prepared is never recompiled
+    query_cache_size=1024,
+    connect_args={
+        # SQLAlchemy's per-connection cache of asyncpg prepared statements
+        "prepared_statement_cache_size": 1024,
+        # asyncpg's own statement cache
+        "statement_cache_size": 1024,
+        # Short OLTP and analytics queries never recoup JIT compile time
+        "server_settings": {"jit": "off"},
+    },
 )
 
 # Create async session factory
@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta
-from app.core.security import get_password_hash, generate_activation_token
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.orm import raiseload
+from app.core.security import aget_password_hash, generate_activation_token
+from app.models.user import User
 
+# Applied to every User entity query so lazy loads fail loudly
+NO_LAZY_LOADS = raiseload("*")
 
-def hash_password(plain_password: str) -> str:
-    """Hash a password using the core security utility."""
-    return get_password_hash(plain_password)
+
+async def hash_password(plain_password: str) -> str:
+    """Hash a password using the core security utility, off the event loop."""
+    return await aget_password_hash(plain_password)
 
 
 def generate_activation() -> tuple[str, datetime]:
@@ -14,19 +20,22 @@ def generate_activation() -> tuple[str, datetime]:
     return token, expiry
 
 
-def extract_conflicting_field(db_error: str) -> str:
+def location_point(location: tuple[float, float]) -> ColumnElement:
     """
-    Extract the conflicting field from a database integrity error message.
-    Works for common patterns in Postgres/MySQL/SQLite.
+    Build a WGS 84 point for User.location from (longitude, latitude).
+
+    The point is constructed by PostGIS, so the geometry column stays the
+    only stored copy of the coordinates.
     """
-    lower = db_error.lower()
+    longitude, latitude = location
+    return func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
 
-    if "email" in lower:
-        return "email"
-    if "phone" in lower:
-        return "phone_number"
-    if "username" in lower:
-        return "username"
 
-    # fallback for unknown constraint
-    return "field"
+def select_user() -> Select:
+    """
+    Select User entities with lazy loading disabled.
+
+    Reading a relationship that the query did not eager-load raises instead
+    of silently issuing one query per row; opt in with selectinload(...).
+    """
+    return select(User).options(NO_LAZY_LOADS)
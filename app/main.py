@@ -2,9 +2,11 @@ from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, stop_logging
 from app.database import init_db, close_db
 from app.core.redis import init_redis, close_redis
+from app.core.queue import init_queue, close_queue
+from app.core.email import close_smtp_pool
 from app.config import settings
 from app.api.v1 import admin, health, auth, users
 
@@ -20,15 +22,19 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     await init_db()
     await init_redis()
+    await init_queue()
     logger.info("Application startup complete")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    await close_queue()
+    await close_smtp_pool()
     await close_redis()
     await close_db()
     logger.info("Application shutdown complete")
+    stop_logging()
 
 
 app = FastAPI(
@@ -44,10 +50,9 @@ app = FastAPI(
 )
 
 # Add custom middleware
-from app.core.middleware import RequestLoggingMiddleware, SecurityHeadersMiddleware
+from app.core.middleware import ObservabilityMiddleware
 
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(ObservabilityMiddleware)
 
 # CORS Configuration
 app.add_middleware(
@@ -68,7 +73,7 @@ app.include_router(health.router, tags=["Health"])
 
 
 @app.get("/", tags=["Root"])
-async def root():
+async def root() -> dict:
     """API root endpoint."""
     logger.debug("Root endpoint accessed")
     return {
@@ -1,9 +1,18 @@
 from enum import Enum
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, Boolean, Enum as SQLEnum, Text
+from sqlalchemy import (
+    String,
+    DateTime,
+    Boolean,
+    Enum as SQLEnum,
+    LargeBinary,
+    Index,
+    Computed,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
-from geoalchemy2 import Geography
+from geoalchemy2 import Geometry
 from app.database import Base
 
 
@@ -15,10 +24,20 @@ class UserRole(str, Enum):
     RIDER = "rider"
 
 
+class AuthProvider(str, Enum):
+    """OAuth provider enumeration."""
+
+    GOOGLE = "google"
+    FACEBOOK = "facebook"
+    APPLE = "apple"
+
+
 class User(Base):
     """User model with geolocation support."""
 
     __tablename__ = "users"
+    # Fetch server-generated values (created_at) with RETURNING on insert
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -47,33 +66,47 @@ class User(Base):
     auth_provider: Mapped[Optional[str]] = mapped_column(
         String(50), nullable=True, comment="OAuth provider: google, facebook, apple"
     )
+    # Looked up together with auth_provider via uq_users_auth_provider_user_id
     provider_user_id: Mapped[Optional[str]] = mapped_column(
-        String(255), nullable=True, index=True, comment="Unique ID from OAuth provider"
+        String(255), nullable=True, comment="Unique ID from OAuth provider"
     )
     activation_token: Mapped[Optional[str]] = mapped_column(
-        String(255), nullable=True, index=True, comment="Token for account activation"
+        String(255), nullable=True, comment="Token for account activation"
     )
     activation_token_expiry: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True, comment="Activation token expiry time"
     )
-    refresh_token: Mapped[Optional[str]] = mapped_column(
-        Text, nullable=True, comment="Current refresh token"
+    refresh_token_hash: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary(32),
+        nullable=True,
+        comment="SHA-256 of the current refresh token; the token itself is never stored",
     )
     last_login: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True, comment="Last successful login time"
     )
 
     # Location information
+    # Unindexed: filters go through city_norm
     city: Mapped[str] = mapped_column(String(100), default="Abuja", nullable=False)
+    city_norm: Mapped[str] = mapped_column(
+        String(100),
+        Computed("lower(city)", persisted=True),
+        index=True,
+        comment="Lower-cased city for case-insensitive filtering",
+    )
     location: Mapped[Optional[str]] = mapped_column(
-        Geography(geometry_type="POINT", srid=4326),
+        # Planar WGS 84 geometry: GiST-indexed bounding-box predicates without
+        # spheroidal math; cast to geography only where metres are needed
+        Geometry(geometry_type="POINT", srid=4326, spatial_index=True),
         nullable=True,
         comment="GPS coordinates for future mapping features",
     )
 
     # Metadata
+    # No single-column index: ix_users_created_at_id_desc and
+    # ix_users_analytics below both lead on created_at
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     is_exported: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     email_confirmed: Mapped[bool] = mapped_column(
@@ -82,3 +115,35 @@ class User(Base):
 
     def __repr__(self) -> str:
         return f"<User {self.email} - {self.role.value}>"
+
+
+# Keyset pagination index for newest-first listings
+Index("ix_users_created_at_id_desc", User.created_at.desc(), User.id.desc())
+
+# Covering index for analytics windows: the created_at range plus every
+# column the aggregates read, so they run as index-only scans
+Index(
+    "ix_users_analytics",
+    User.created_at.desc(),
+    postgresql_include=["role", "email_confirmed", "city"],
+)
+
+# Social login lookup by provider and provider user id; only rows that came
+# from an OAuth provider are indexed. The included columns are the ones the
+# lookup selects, so it is answered index-only
+Index(
+    "uq_users_auth_provider_user_id",
+    User.auth_provider,
+    User.provider_user_id,
+    unique=True,
+    postgresql_where=User.provider_user_id.isnot(None),
+    postgresql_include=["id", "email", "role"],
+)
+
+# Activation lookup; only accounts still waiting for activation are indexed
+Index(
+    "ix_users_activation",
+    User.email,
+    User.activation_token,
+    postgresql_where=(User.activation_token.isnot(None) & (User.is_active == False)),
+)
@@ -2,10 +2,12 @@ from app.schemas.user import (
     UserCreate,
     UserResponse,
     UserListResponse,
+    RecentUsersResponse,
 )
 
 __all__ = [
     "UserCreate",
     "UserResponse",
     "UserListResponse",
+    "RecentUsersResponse",
 ]
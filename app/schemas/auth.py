@@ -1,9 +1,14 @@
 """Authentication and user schemas."""
 
+import re
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from app.models.user import UserRole
+from app.models.user import AuthProvider, UserRole
+
+# Every strength rule in one scan: 8+ characters with an uppercase letter,
+# a lowercase letter and a digit
+_STRONG_PASSWORD_RE = re.compile(r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d).{8,}", re.DOTALL)
 
 
 # Request schemas
@@ -17,9 +22,7 @@ class LoginRequest(BaseModel):
 class SocialSignupRequest(BaseModel):
     """Social authentication signup/login request."""
 
-    provider: Literal["google", "facebook", "apple"] = Field(
-        ..., description="OAuth provider"
-    )
+    provider: AuthProvider = Field(..., description="OAuth provider")
     access_token: str = Field(..., description="Access token from OAuth provider")
     email: EmailStr = Field(..., description="User email from OAuth provider")
     full_name: str = Field(..., description="Full name from OAuth provider")
@@ -37,8 +40,10 @@ class SocialSignupRequest(BaseModel):
     @classmethod
     def validate_password_strength(cls, v: Optional[str]) -> Optional[str]:
         """Validate password meets minimum strength requirements if provided."""
-        if v is None:
+        if v is None or _STRONG_PASSWORD_RE.fullmatch(v):
             return v
+
+        # Slow path: find which rule failed for the error message
         if len(v) < 8:
             raise ValueError("Password must be at least 8 characters long")
         if not any(c.isupper() for c in v):
@@ -1,8 +1,13 @@
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic_extra_types.coordinate import Latitude, Longitude
 from pydantic_extra_types.phone_numbers import PhoneNumber
 from app.models.user import UserRole
 
+# Separators dropped from phone numbers in a single pass
+_PHONE_STRIP = str.maketrans("", "", " -()")
+
 
 class UserCreate(BaseModel):
     """Schema for creating user."""
@@ -21,6 +26,9 @@ class UserCreate(BaseModel):
         min_length=8,
         description="Password for the account",
     )
+    location: tuple[Longitude, Latitude] | None = Field(
+        default=None, description="GPS coordinates as (longitude, latitude)"
+    )
 
    
 
@@ -31,15 +39,19 @@ class UserCreate(BaseModel):
         if isinstance(v, PhoneNumber):
             return str(v)
 
+        # Fast path: already in +234XXXXXXXXXX form, nothing to normalize
+        if (
+            isinstance(v, str)
+            and len(v) == 14
+            and v.startswith("+234")
+            and v[4:].isdigit()
+        ):
+            return v
+
         phone_str = str(v).strip()
 
         # Remove any spaces, dashes, or parentheses
-        phone_str = (
-            phone_str.replace(" ", "")
-            .replace("-", "")
-            .replace("(", "")
-            .replace(")", "")
-        )
+        phone_str = phone_str.translate(_PHONE_STRIP)
 
         # If already has country code, return as is
         if phone_str.startswith("+"):
@@ -94,9 +106,17 @@ class UserListResponse(BaseModel):
     page: int
     page_size: int
     users: list[UserResponse]
+    next_cursor: str | None = None
+
+
+class RecentUsersResponse(BaseModel):
+    """Schema for the most recent signups."""
+
+    count: int
+    users: list[UserResponse]
 
 
-class ExportFormat(str):
+class ExportFormat(str, Enum):
     """Export format options."""
 
     CSV = "csv"
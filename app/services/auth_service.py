@@ -0,0 +1,98 @@
+import logging
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, bindparam, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.schemas.auth import LoginRequest, TokenResponse
+from app.core.security import (
+    averify_password,
+    create_access_token,
+    create_refresh_token,
+    hash_token,
+)
+from app.core.redis import cache_access_token
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Built once at import; each login only binds parameters
+LOGIN_STMT = select(
+    User.id, User.email, User.password, User.role, User.is_active
+).where(User.email == bindparam("email"))
+LOGIN_UPDATE_STMT = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(
+        refresh_token_hash=bindparam("new_refresh_token_hash"),
+        last_login=func.now(),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+
+async def login_with_password(
+    login_data: LoginRequest, db: AsyncSession
+) -> TokenResponse:
+    """
+    Authenticate a user with email and password and issue tokens.
+
+    - Verifies the password against the stored hash
+    - Requires an activated account
+    - Stores the new refresh token and last login time
+
+    Raises:
+        HTTPException: If credentials are invalid or account not activated
+    """
+    logger.info(f"Login attempt for email: {login_data.email}")
+
+    result = await db.execute(LOGIN_STMT, {"email": login_data.email})
+    user = result.one_or_none()
+
+    # Verify user exists, has a password (local account) and it matches
+    if (
+        not user
+        or not user.password
+        or not await averify_password(login_data.password, user.password)
+    ):
+        logger.warning(f"Failed login attempt for email: {login_data.email}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Check if account is activated
+    if not user.is_active:
+        logger.warning(f"Inactive account login attempt: {login_data.email}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account not activated. Please check your email for activation instructions.",
+        )
+
+    # Create tokens
+    access_token = create_access_token(
+        data={"sub": user.email, "role": user.role.value}
+    )
+    refresh_token = create_refresh_token(data={"sub": user.email})
+
+    # Update user's refresh token and last login
+    await db.execute(
+        LOGIN_UPDATE_STMT,
+        {
+            "user_id": user.id,
+            "new_refresh_token_hash": hash_token(refresh_token),
+        },
+    )
+    await db.commit()
+    await cache_access_token(
+        user.email, access_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+    logger.info(f"Successful login for user: {login_data.email}")
+
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
@@ -1,69 +1,157 @@
+import asyncio
 import logging
-from sqlalchemy.exc import IntegrityError
+from typing import Any
+from sqlalchemy import insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import BackgroundTasks
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.helpers.user_helpers import (
     hash_password,
     generate_activation,
-    extract_conflicting_field,
+    location_point,
 )
-from app.core.email import send_confirmation_email
 
 logger = logging.getLogger(__name__)
 
 
-async def create_user(
-    data: UserCreate, db: AsyncSession, background_tasks: BackgroundTasks
-) -> User:
+async def create_user(data: UserCreate, db: AsyncSession) -> User:
     """
     Create a new local user.
 
     - Hashes password
     - Generates activation token
-    - Inserts into DB
-    - Handles unique constraint violations
-    - Sends confirmation email
+    - Inserts into DB, skipping rows that hit a unique index
+    - Reports which field is already registered
+
+    The caller commits and then sends the confirmation email and calls
+    invalidate_signup_metrics(), so neither happens for a signup that is
+    rolled back, and no cached count is re-read before the commit.
     """
     token, expiry = generate_activation()
+    phone_number = str(data.phone_number)
 
-    new_user = User(
-        full_name=data.full_name,
-        email=data.email,
-        phone_number=str(data.phone_number),
-        role=data.role,
-        city=data.city,
-        password=hash_password(data.password),
-        activation_token=token,
-        activation_token_expiry=expiry,
+    # Duplicates come back as no row instead of an IntegrityError, so the
+    # transaction stays usable and nothing has to be rolled back
+    stmt = (
+        pg_insert(User)
+        .values(
+            full_name=data.full_name,
+            email=data.email,
+            phone_number=phone_number,
+            role=data.role,
+            city=data.city,
+            password=await hash_password(data.password),
+            activation_token=token,
+            activation_token_expiry=expiry,
+            location=location_point(data.location) if data.location else None,
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
 
     try:
-        db.add(new_user)
-        await db.flush()
-        await db.refresh(new_user)
-
-        background_tasks.add_task(
-            send_confirmation_email,
-            to_email=new_user.email,
-            full_name=new_user.full_name,
-            role=new_user.role.value,
-        )
-
-        return new_user
-
-    except IntegrityError as e:
+        new_user = (await db.scalars(stmt)).one_or_none()
+    except Exception:
         await db.rollback()
-        # e.orig contains the original DBAPI exception
-        error_msg = str(e.orig) if e.orig else str(e)
-        conflict_field = extract_conflicting_field(error_msg)
+        logger.exception("Unexpected error during local user creation")
+        raise
+
+    if new_user is None:
+        conflict_field = await _find_conflicting_field(db, data.email, phone_number)
         logger.warning(f"Unique constraint error on field: {conflict_field}")
 
         # Raise a structured exception your route layer will catch
         raise ValueError(f"{conflict_field} is already registered")
 
-    except Exception:
-        await db.rollback()
-        logger.exception("Unexpected error during local user creation")
-        raise
+    return new_user
+
+
+async def _find_conflicting_field(
+    db: AsyncSession, email: str, phone_number: str
+) -> str:
+    """Name the unique field an insert skipped by ON CONFLICT collided on."""
+    result = await db.execute(
+        select(User.email == email)
+        .where(or_(User.email == email, User.phone_number == phone_number))
+        .order_by((User.email == email).desc())
+        .limit(1)
+    )
+    email_taken = result.scalar_one_or_none()
+    if email_taken is None:
+        # The conflicting row is gone again; report the likelier field
+        return "email"
+    return "email" if email_taken else "phone_number"
+
+
+async def bulk_insert_users(db: AsyncSession, rows: list[dict[str, Any]]) -> list[int]:
+    """
+    Insert many users with batched multi-row INSERT statements.
+
+    The rows go to a single ``insert(User)`` execution, which SQLAlchemy
+    sends as "insertmanyvalues" batches of up to 1000 rows per statement
+    instead of one round trip per user. Column defaults are applied per
+    row; every row must have the same keys. The caller commits and then
+    calls invalidate_signup_metrics().
+
+    Args:
+        db: Database session
+        rows: Column values for each user, passwords already hashed
+
+    Returns:
+        list[int]: New user ids, in the order of ``rows``
+    """
+    if not rows:
+        return []
+
+    result = await db.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True), rows
+    )
+    return list(result.scalars())
+
+
+async def bulk_create_users(rows: list[UserCreate], db: AsyncSession) -> list[int]:
+    """
+    Create many local users in batched INSERT statements.
+
+    Passwords are hashed concurrently on worker threads (bcrypt releases
+    the GIL), then all rows go to the database through bulk_insert_users.
+    A duplicate email or phone number fails the whole batch with an
+    IntegrityError. The caller commits and then calls
+    invalidate_signup_metrics().
+
+    Args:
+        rows: Validated signups
+        db: Database session
+
+    Returns:
+        list[int]: New user ids, in the order of ``rows``
+    """
+    hashed_passwords = await asyncio.gather(
+        *(hash_password(data.password) for data in rows)
+    )
+
+    values = []
+    for data, hashed_password in zip(rows, hashed_passwords):
+        token, expiry = generate_activation()
+        values.append(
+            {
+                "full_name": data.full_name,
+                "email": data.email,
+                "phone_number": str(data.phone_number),
+                "role": data.role,
+                "city": data.city,
+                "password": hashed_password,
+                "activation_token": token,
+                "activation_token_expiry": expiry,
+                # Batched rows take plain parameters; the column's bind
+                # expression builds the point with ST_GeomFromEWKT
+                "location": (
+                    f"SRID=4326;POINT({data.location[0]} {data.location[1]})"
+                    if data.location
+                    else None
+                ),
+            }
+        )
+
+    return await bulk_insert_users(db, values)
@@ -0,0 +1,40 @@
+"""
+arq worker for queued background jobs.
+
+Run with: arq app.worker.WorkerSettings
+"""
+
+from arq import func
+from arq.connections import RedisSettings
+from app.config import settings
+from app.core.email import close_smtp_pool, send_confirmation_email
+from app.core.logging import setup_logging, stop_logging
+
+
+async def send_confirmation_email_job(
+    ctx: dict, to_email: str, full_name: str, role: str
+) -> bool:
+    """Send a queued signup confirmation email."""
+    return await send_confirmation_email(
+        to_email=to_email, full_name=full_name, role=role
+    )
+
+
+async def startup(ctx: dict) -> None:
+    """Configure logging for the worker process."""
+    setup_logging()
+
+
+async def shutdown(ctx: dict) -> None:
+    """Close pooled SMTP connections and flush logs."""
+    await close_smtp_pool()
+    stop_logging()
+
+
+class WorkerSettings:
+    """arq worker configuration."""
+
+    functions = [func(send_confirmation_email_job, name="send_confirmation_email")]
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
+    on_startup = startup
+    on_shutdown = shutdown